@@ -55,6 +55,16 @@ logger = logging.getLogger(__name__)
 
 # --- Constants ---
 DEFAULT_KROKI_URL = "http://localhost:8000"  # Default Kroki instance URL
+# Written as mermaid_version/readme.md by the CLI (--add-readme) and the GUI
+README_TEMPLATE = (
+    "This folder contains the original version ('{orig}') of a Markdown file "
+    "that included Mermaid diagrams.\n\n"
+    "The file was moved here because Mermaid diagrams may not render correctly "
+    "in all Markdown viewers or platforms.\n\n"
+    "A converted version of the file, with Mermaid diagrams rendered as images "
+    "('{fmt}'), should be located in the parent directory ('{dir}') "
+    "with the name '{out}'."
+)
 
 
 # --- Configuration Loading ---
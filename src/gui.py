@@ -1,12 +1,20 @@
+import collections
+import concurrent.futures
+import dataclasses
+import errno
 import json
 import logging
+import logging.handlers
 import os
 import queue
 import shutil  # Needed for moving files
+import stat
+import subprocess
 import sys
 import threading
 import tkinter as tk
-import traceback
+from pathlib import PurePath
+from typing import Optional
 from tkinter import (
     Label,
     Toplevel,
@@ -35,6 +43,7 @@ try:
     )  # Check if library is available (defined in converter.py)
     from converter import load_diagram_config  # Used for 'Edit Config'/'Create Default'
     from converter import process_markdown_file
+    from converter import README_TEMPLATE  # Contents of the moved file's readme.md
 
     # If the import above succeeds, set the local flag to True
     CONVERTER_AVAILABLE = True
@@ -66,10 +75,12 @@ except ImportError:
 
 except Exception as import_err:
     # Handle other unexpected errors during the import process
+    import traceback  # Only needed on this rare failure path
+
     print(
         f"ERROR: Unexpected error importing 'converter': {import_err}", file=sys.stderr
     )
-    traceback.print_exc()
+    traceback.print_exception(import_err)
 
     # CONVERTER_AVAILABLE remains False
     # MERMAID_AVAILABLE remains False
@@ -89,33 +100,129 @@ DEFAULT_OUTPUT_SUFFIX = "-img"  # Default suffix for output markdown file name
 DEFAULT_CONFIG_FILENAME = "diagram_config.json"  # Default config filename
 APP_TITLE = "Mermaid Markdown Converter"  # Application window title
 MERMAID_VERSION_DIR = "mermaid_version"  # Subdirectory name for moved original files
+# Log level number -> tag name configured on the log Text widget
+_LEVEL_TAGS = {
+    logging.DEBUG: "DEBUG",
+    logging.INFO: "INFO",
+    logging.WARNING: "WARNING",
+    logging.ERROR: "ERROR",
+    logging.CRITICAL: "CRITICAL",
+}
+GUI_QUEUE_MAXSIZE = 5000  # Pending GUI log lines before DEBUG/INFO lines are dropped
+_BANNER_START = "=" * 25 + " Starting Conversion " + "=" * 25
+_BANNER_END = "=" * 25 + " Process Finished " + "=" * 25
+# Process summary logged by conversion_completed; filled via str.format_map
+SUMMARY_TEMPLATE = (
+    "\n------------------- Process Summary -------------------\n"
+    "Input File:           {input_file_path}\n"
+    "Converter Used:       {method_used}\n"
+    "Output File:          {output_display}\n"
+    "Image Directory:      {image_directory}\n"
+    "Diagrams Found:       {total_diagrams}\n"
+    "Successfully Converted: {successful_conversions}\n"
+    "Failed Conversions:   {failed_conversions}\n"
+    "Rolled Back:          {rolled_back_display}\n"
+    "Original Moved:       {moved_display}\n"
+    "README Added:         {readme_display}\n"
+    "----------------------------------------------------------"
+)
+SUMMARY_DEFAULTS = {
+    "input_file_path": "N/A",
+    "method_used": "N/A",
+    "image_directory": "N/A",
+    "total_diagrams": 0,
+    "successful_conversions": 0,
+    "failed_conversions": 0,
+}
+LOG_WATCHDOG_MS = 1000  # Safety poll of the log queue; <<LogEvent>> does the real work
+LOG_BATCH_MAX = 500  # Most log lines drained and inserted per GUI tick
+LOG_MAX_LINES = 5000  # Log widget is trimmed once it grows past this many lines
+LOG_TRIM_TO_LINES = 4000  # ...back down to this many of the most recent lines
+
+
+@dataclasses.dataclass(slots=True)
+class ConversionOptions:
+    """Snapshot of the GUI settings for one conversion run."""
+
+    method: str = "library"
+    kroki_url: Optional[str] = None
+    image_prefix: str = "diagram"
+    image_format: str = "svg"
+    image_dir: Optional[str] = None
+    config_path_input: Optional[str] = None
+    use_html_wrapper: bool = True
+    output_suffix: str = "-img"
+    move_original_requested: bool = False
+    add_readme_requested: bool = False
+
 
 # --- Logging Setup ---
-log_queue = queue.Queue()  # Thread-safe queue for log messages from background tasks
+log_queue = queue.SimpleQueue()  # Thread-safe queue for log records from any thread
+# Pre-formatted (message, level tag) pairs for the GUI; deque append/popleft are
+# atomic, so no lock is needed between the listener thread and the Tk thread
+gui_log_deque = collections.deque()
 logger = logging.getLogger()  # Get the root logger instance
+_log = logging.getLogger(__name__)  # Module logger shared by the helper functions
+# Single GUI formatter, built once; applied by the QueueHandler on the producer thread
+GUI_LOG_FORMATTER = logging.Formatter(
+    "%(asctime)s - %(levelname)s - [%(name)s] %(message)s", datefmt="%H:%M:%S"
+)
 
 
-class QueueHandler(logging.Handler):
+class GuiSinkHandler(logging.Handler):
     """
-    Custom logging handler that puts log records into a thread-safe Queue.
-    The GUI thread will periodically check this queue to display log messages.
+    Logging handler run by the QueueListener thread.
+    Records arrive already formatted by the QueueHandler, so this only pushes
+    the final string onto gui_log_deque and wakes the GUI thread through the
+    optional notify callback (at most once until the GUI drains the queue).
+    When the GUI falls behind, DEBUG/INFO lines are dropped (and counted) so
+    the queue stays bounded; WARNING and above are always kept.
     """
 
-    def __init__(self, log_queue_instance):
+    def __init__(self, log_deque):
         super().__init__()
-        self.log_queue = log_queue_instance
-        self.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        self.log_deque = log_deque
+        self.dropped = 0
+        self.notify = None  # Set by the GUI; wakes the Tk thread to drain the queue
+        self.pending = threading.Event()  # Set while a wake-up is outstanding
 
     def emit(self, record):
-        """Puts the log record into the queue."""
-        record.handler = self
-        self.log_queue.put(record)
+        """Puts the pre-formatted (message, level tag) pair into the GUI queue."""
+        try:
+            if (
+                record.levelno < logging.WARNING
+                and len(self.log_deque) >= GUI_QUEUE_MAXSIZE
+            ):
+                self.dropped += 1
+                return
+            if self.dropped:
+                self.log_deque.append(
+                    (
+                        f"({self.dropped} DEBUG/INFO messages dropped due to GUI backpressure)",
+                        "WARNING",
+                    )
+                )
+                self.dropped = 0
+            self.log_deque.append(
+                (record.getMessage(), _LEVEL_TAGS.get(record.levelno, "INFO"))
+            )
+            notify = self.notify
+            if notify is not None and not self.pending.is_set():
+                self.pending.set()
+                try:
+                    notify()
+                except (RuntimeError, tk.TclError):
+                    # Main loop not running (yet) or window gone; watchdog poll covers it
+                    self.pending.clear()
+        except Exception:
+            self.handleError(record)
 
 
 def setup_gui_logger():
     """
     Configures the root logger specifically for the GUI.
-    Removes existing handlers and adds a QueueHandler.
+    Removes existing handlers, adds a QueueHandler and starts a QueueListener
+    that feeds a GuiSinkHandler. Returns the started listener and the sink.
     """
     for handler in logger.handlers[:]:
         try:
@@ -124,21 +231,47 @@ def setup_gui_logger():
         except Exception as e:
             print(f"Warning: Error removing logger handler: {e}", file=sys.stderr)
 
-    queue_handler = QueueHandler(log_queue)
-    gui_formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - [%(name)s] %(message)s", datefmt="%H:%M:%S"
-    )
-    queue_handler.setFormatter(gui_formatter)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(GUI_LOG_FORMATTER)  # Formatted once, in prepare()
     logger.addHandler(queue_handler)
+    gui_sink = GuiSinkHandler(gui_log_deque)
     logger.setLevel(logging.INFO)
 
+    listener = logging.handlers.QueueListener(
+        log_queue, gui_sink, respect_handler_level=True
+    )
+    listener.start()
+    return listener, gui_sink
+
+
+_requests_available = None  # Result of the first 'import requests' probe
+
+
+def _check_requests_available():
+    """Returns True if 'requests' can be imported. The probe runs only once."""
+    global _requests_available
+    if _requests_available is None:
+        try:
+            import requests
+
+            _requests_available = True
+        except ImportError:
+            _requests_available = False
+    return _requests_available
+
+
+_deps_cache = None  # Result of the first check_dependencies() call
+
 
 def check_dependencies():
     """
     Checks if core dependencies seem available. Returns list of issues.
     Uses the locally defined CONVERTER_AVAILABLE and the imported MERMAID_AVAILABLE.
+    The result is computed once and cached for the rest of the session.
     """
-    func_logger = logging.getLogger(__name__ + ".check_dependencies")
+    global _deps_cache
+    if _deps_cache is not None:
+        return list(_deps_cache)
     missing = []
     # Check if the converter module itself loaded successfully (using the local flag)
     if not CONVERTER_AVAILABLE:
@@ -162,27 +295,41 @@ def check_dependencies():
         )
 
     # Check for requests (needed for Kroki)
-    try:
-        import requests
-    except ImportError:
+    if not _check_requests_available():
         missing.append("requests (package) - Not found (required for 'Kroki' method).")
 
-    func_logger.debug(f"Dependency check results: {missing or 'OK'}")
-    return missing
+    _log.debug("Dependency check results: %s", missing or "OK")
+    _deps_cache = missing
+    return list(missing)
 
 
 # --- Helper Functions for File Operations ---
+def _log_error_digest(log, message, err, *args):
+    """
+    Logs a one-line ERROR for err; message is a %-style format for args. A
+    short traceback is formatted only when DEBUG is enabled, instead of a full
+    exc_info walk on every error record.
+    """
+    log.error(message + ": %s: %s", *args, type(err).__name__, err)
+    if log.isEnabledFor(logging.DEBUG):
+        import traceback
+
+        log.debug("Traceback:\n%s", traceback.format_exc(limit=5))
+
+
 # (These functions remain the same)
 def _write_output_file(output_path, content):
-    func_logger = logging.getLogger(__name__)
     try:
-        with open(output_path, "w", encoding="utf-8") as f:
+        # Large buffer so the whole document goes out in as few writes as possible
+        with open(
+            output_path, "w", encoding="utf-8", buffering=1 << 20, newline=""
+        ) as f:
             f.write(content)
-        func_logger.info(f"Successfully created output file: {output_path}")
+        _log.info("Successfully created output file: %s", output_path)
         return True
     except Exception as write_err:
-        func_logger.error(
-            f"Failed to write output file {output_path}: {write_err}", exc_info=True
+        _log.error(
+            "Failed to write output file %s: %s", output_path, write_err, exc_info=True
         )
         return False
 
@@ -190,75 +337,209 @@ def _write_output_file(output_path, content):
 def _move_original_and_readme(
     original_path, move_dest_dir, add_readme_flag, output_file_name, image_format
 ):
-    func_logger = logging.getLogger(__name__)
     original_moved = False
     readme_added = False
+    orig = PurePath(original_path)
+    dest = PurePath(move_dest_dir)
     try:
         os.makedirs(move_dest_dir, exist_ok=True)
-        func_logger.info(
-            f"Ensured '{os.path.basename(move_dest_dir)}' directory exists: {move_dest_dir}"
-        )
-        original_filename = os.path.basename(original_path)
-        move_dest_path = os.path.join(move_dest_dir, original_filename)
-        func_logger.info(
-            f"Attempting to move original file '{original_path}' to '{move_dest_path}'"
+        _log.info("Ensured '%s' directory exists: %s", dest.name, move_dest_dir)
+        original_filename = orig.name
+        move_dest_path = str(dest / original_filename)
+        _log.info(
+            "Attempting to move original file '%s' to '%s'",
+            original_path,
+            move_dest_path,
         )
-        shutil.move(original_path, move_dest_path)
-        func_logger.info(f"Successfully moved original file to: {move_dest_path}")
+        try:
+            os.replace(original_path, move_dest_path)  # Single rename, same filesystem
+        except OSError as rename_err:
+            if rename_err.errno != errno.EXDEV:
+                raise
+            shutil.move(original_path, move_dest_path)  # Cross-device fallback
+        _log.info("Successfully moved original file to: %s", move_dest_path)
         original_moved = True
         if add_readme_flag:
-            readme_path = os.path.join(move_dest_dir, "readme.md")
-            output_md_dir = os.path.dirname(original_path)
-            readme_content = (
-                f"This folder contains the original version ('{original_filename}') ...\n"  # (content same as before)
-                f"A converted version ... name '{output_file_name}'."
+            readme_path = str(dest / "readme.md")
+            readme_content = README_TEMPLATE.format(
+                orig=original_filename,
+                fmt=image_format.upper(),
+                dir=orig.parent,
+                out=output_file_name,
             )
             try:
-                with open(readme_path, "w", encoding="utf-8") as rf:
+                with open(readme_path, "w", encoding="utf-8", buffering=1 << 16) as rf:
                     rf.write(readme_content)
-                func_logger.info(f"Successfully created readme.md in {move_dest_dir}")
+                _log.info("Successfully created readme.md in %s", move_dest_dir)
                 readme_added = True
             except Exception as readme_err:
-                func_logger.error(
-                    f"Failed to create readme.md in {move_dest_dir}: {readme_err}",
+                _log.error(
+                    "Failed to create readme.md in %s: %s",
+                    move_dest_dir,
+                    readme_err,
                     exc_info=True,
                 )
     except OSError as move_os_err:
-        func_logger.error(
-            f"Failed to create directory '{move_dest_dir}': {move_os_err}",
+        _log.error(
+            "Failed to create directory '%s': %s",
+            move_dest_dir,
+            move_os_err,
             exc_info=True,
         )
     except Exception as move_err:
-        func_logger.error(
-            f"Failed to move original file '{original_path}' to '{move_dest_dir}': {move_err}",
+        _log.error(
+            "Failed to move original file '%s' to '%s': %s",
+            original_path,
+            move_dest_dir,
+            move_err,
             exc_info=True,
         )
         original_moved = False
     return original_moved, readme_added
 
 
+class ArtifactWriter:
+    """
+    Runs buffered (non-critical) file operations, such as moving the original
+    file and writing readme.md, on a single daemon thread so the caller does
+    not block on disk I/O. Critical writes (the converted .md) stay synchronous.
+    """
+
+    _STOP = object()  # Sentinel that ends the writer loop
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()  # No join()/task_done() needed
+        self._lock = threading.Lock()  # Orders submit() against flush()
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="artifact-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, op):
+        """
+        Queues a zero-argument callable to run on the writer thread. Returns
+        False, without queuing, once flush() has stopped the writer.
+        """
+        with self._lock:
+            if self._stopped:
+                return False
+            self._queue.put(op)
+        return True
+
+    def _run(self):
+        while True:
+            op = self._queue.get()
+            if op is self._STOP:
+                break
+            try:
+                op()
+            except Exception as op_err:
+                _log.error(
+                    "Background file operation failed: %s", op_err, exc_info=True
+                )
+
+    def flush(self, pump=None):
+        """
+        Runs all pending operations, then stops the writer thread. pump, if
+        given, is called while waiting so the caller's event loop keeps running.
+        """
+        with self._lock:
+            if not self._stopped:
+                self._stopped = True
+                self._queue.put(self._STOP)
+        while self._thread.is_alive():
+            if pump is not None:
+                pump()
+            self._thread.join(0.01)
+
+
+class ConversionWorker:
+    """
+    Runs conversion steps in order on a single daemon thread and returns a
+    concurrent.futures.Future for each. ThreadPoolExecutor workers are joined
+    at interpreter exit; this thread is not, so closing the window during a
+    conversion does not keep the process alive until it finishes.
+    """
+
+    _STOP = object()  # Sentinel that ends the worker loop
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="converter", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args):
+        """Queues fn(*args) and returns a Future for its result."""
+        if self._closed:
+            raise RuntimeError("cannot schedule new work after shutdown")
+        future = concurrent.futures.Future()
+        self._queue.put((future, fn, args))
+        return future
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            future, fn, args = item
+            if self._closed:
+                future.cancel()  # Queued before shutdown but never started
+                continue
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    def shutdown(self):
+        """
+        Cancels queued work and lets the running step finish on its own; does
+        not wait for it. Safe to call more than once.
+        """
+        if not self._closed:
+            self._closed = True
+            while True:
+                try:
+                    future, _, _ = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                future.cancel()
+            self._queue.put(self._STOP)
+
+
 def _rollback_images(image_paths):
-    func_logger = logging.getLogger(__name__)
-    func_logger.warning("Rolling back changes: Deleting generated images...")
+    _log.warning("Rolling back changes: Deleting generated images...")
     deleted_count = 0
     if not image_paths:
-        func_logger.warning("Rollback requested, but no images were generated.")
+        _log.warning("Rollback requested, but no images were generated.")
         return 0
+    missing = []
     for img_path in image_paths:
         try:
-            if os.path.isfile(img_path):
-                os.remove(img_path)
-                func_logger.info(f"Deleted image during rollback: {img_path}")
-                deleted_count += 1
-            else:
-                func_logger.warning(f"Image file not found during rollback: {img_path}")
+            # Remove directly; a missing file surfaces as FileNotFoundError
+            os.remove(img_path)
+            deleted_count += 1
+        except FileNotFoundError:
+            missing.append(img_path)
         except OSError as del_err:
-            func_logger.error(
-                f"Failed to delete image during rollback {img_path}: {del_err}",
-                exc_info=True,
+            _log_error_digest(
+                _log, "Failed to delete image during rollback %s", del_err, img_path
             )
-    func_logger.warning(
-        f"Rollback complete. Deleted {deleted_count}/{len(image_paths)} generated images."
+    if missing:
+        _log.warning(
+            "%s image file(s) not found during rollback: %s",
+            len(missing),
+            ", ".join(missing),
+        )
+    _log.warning(
+        "Rollback complete. Deleted %s/%s generated images.",
+        deleted_count,
+        len(image_paths),
     )
     return deleted_count
 
@@ -303,12 +584,21 @@ class MermaidConverterGUI:
     def __init__(self, root_window):
         """Initialize the GUI application window and widgets."""
         self.root = root_window
+        # Cleared on shutdown; callbacks check this instead of probing Tk
+        self._alive = True
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self.root.title(APP_TITLE)
         self.root.geometry("850x750")
         self.root.minsize(700, 600)
 
-        setup_gui_logger()
-        self.logger = logging.getLogger(__name__)
+        self.log_listener, self.log_sink = setup_gui_logger()
+        self.logger = _log
+        self.artifact_writer = ArtifactWriter()
+        # One reusable worker thread for conversions instead of a thread per click
+        self._conversion_worker = ConversionWorker()
+        # Worker-to-GUI callbacks, run together in one after_idle pass
+        self._gui_mailbox = collections.deque()
+        self._gui_pending = False
         self.logger.info("Initializing GUI...")
 
         # --- Theming & Styles ---
@@ -320,12 +610,12 @@ class MermaidConverterGUI:
                 if theme in available_themes:
                     try:
                         self.style.theme_use(theme)
-                        self.logger.debug(f"Using theme: {theme}")
+                        self.logger.debug("Using theme: %s", theme)
                         break
                     except tk.TclError:
-                        self.logger.debug(f"Theme '{theme}' failed, trying next.")
+                        self.logger.debug("Theme '%s' failed, trying next.", theme)
         except tk.TclError as e:
-            self.logger.warning(f"Theme error: {e}. Using default.")
+            self.logger.warning("Theme error: %s. Using default.", e)
         font_family = "Segoe UI"
         font_size = 10
         self.style.configure("TLabel", font=(font_family, font_size))
@@ -365,11 +655,11 @@ class MermaidConverterGUI:
             script_dir = os.path.dirname(os.path.abspath(__file__))
             default_config_path = os.path.join(script_dir, DEFAULT_CONFIG_FILENAME)
             self.config_file_var.set(default_config_path)
-            self.logger.debug(f"Default config path set: {default_config_path}")
+            self.logger.debug("Default config path set: %s", default_config_path)
         except NameError:
             self.config_file_var.set(DEFAULT_CONFIG_FILENAME)
             self.logger.debug(
-                f"Default config path fallback: {DEFAULT_CONFIG_FILENAME}"
+                "Default config path fallback: %s", DEFAULT_CONFIG_FILENAME
             )
 
         # --- Create UI Sections ---
@@ -384,7 +674,11 @@ class MermaidConverterGUI:
         self.create_status_bar().pack(side=tk.BOTTOM, fill=tk.X)
 
         # --- Initial Setup ---
-        self.check_and_log_dependencies()
+        # Deferred until the main loop is running so the window paints first
+        self.root.after_idle(self.check_and_log_dependencies)
+        # Log lines are flushed when the sink posts <<LogEvent>>, plus a slow watchdog
+        self.root.bind("<<LogEvent>>", lambda event: self._drain_log_queue())
+        self.root.after_idle(self._enable_log_events)  # Only once the loop runs
         self.process_log_queue()
         self._on_converter_method_change()  # Set initial state
         self._on_move_original_toggle()  # Set initial state
@@ -644,7 +938,7 @@ class MermaidConverterGUI:
         missing_deps = check_dependencies()
         if missing_deps:
             self.logger.error("--- Dependency Issues Detected ---")
-            [self.logger.error(f"  - {dep}") for dep in missing_deps]
+            [self.logger.error("  - %s", dep) for dep in missing_deps]
             self.logger.error("Functionality may be limited or fail.")
             if "tkinter" not in str(missing_deps).lower():
                 messagebox.showwarning(
@@ -662,7 +956,7 @@ class MermaidConverterGUI:
         selected_format = self.image_format_var.get()
         new_suffix = f"-{selected_format}"
         self.output_suffix_var.set(new_suffix)
-        self.logger.debug(f"Output suffix auto-updated: {new_suffix}")
+        self.logger.debug("Output suffix auto-updated: %s", new_suffix)
 
     # (_on_move_original_toggle remains the same)
     def _on_move_original_toggle(self):
@@ -670,26 +964,54 @@ class MermaidConverterGUI:
         self.add_readme_checkbox.config(state=state)
         if state == tk.DISABLED:
             self.add_readme_var.set(False)
-        self.logger.debug(
-            f"Move original: {self.move_original_var.get()}, Readme state: {state}"
-        )
+        # Gated: the arguments themselves cost a Tcl round-trip
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Move original: %s, Readme state: %s",
+                self.move_original_var.get(),
+                state,
+            )
 
     # (_on_converter_method_change remains the same)
     def _on_converter_method_change(self):
         state = tk.NORMAL if self.converter_method_var.get() == "kroki" else tk.DISABLED
         self.kroki_url_entry.config(state=state)
-        self.logger.debug(
-            f"Converter method: {self.converter_method_var.get()}, Kroki URL state: {state}"
-        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Converter method: %s, Kroki URL state: %s",
+                self.converter_method_var.get(),
+                state,
+            )
 
     # (_quit_application remains the same)
     def _quit_application(self):
         self.logger.info("Quit button clicked.")
+        self._shutdown()
+
+    def _on_close(self):
+        """WM_DELETE_WINDOW handler; closing the window quits like the Quit button."""
+        self.logger.info("Window closed.")
+        self._shutdown()
+
+    def _shutdown(self):
         if self.is_processing:
             self.logger.warning("Quit during active processing.")
+        self._alive = False  # Workers stop posting to the GUI from here on
+        self.close()
+        # A move already in flight may still be waiting on the Tk thread
+        self.artifact_writer.flush(pump=self.root.update)
+        self._stop_log_listener()
         logging.shutdown()
         self.root.destroy()
 
+    def close(self):
+        """
+        Stops accepting conversion work without waiting for a running one; the
+        worker is a daemon thread, so it does not hold up interpreter exit.
+        Safe to call more than once, including after the window is destroyed.
+        """
+        self._conversion_worker.shutdown()
+
     # --- File/Directory Browsing Methods ---
     # (browse_file, browse_directory, browse_config remain the same)
     def browse_file(self):
@@ -700,7 +1022,7 @@ class MermaidConverterGUI:
         )
         if file_path:
             self.file_path_var.set(file_path)
-            self.logger.info(f"Input file selected: {file_path}")
+            self.logger.info("Input file selected: %s", file_path)
 
     def browse_directory(self):
         dir_path = filedialog.askdirectory(
@@ -708,7 +1030,7 @@ class MermaidConverterGUI:
         )
         if dir_path:
             self.image_dir_var.set(dir_path)
-            self.logger.info(f"Custom image dir selected: {dir_path}")
+            self.logger.info("Custom image dir selected: %s", dir_path)
 
     def browse_config(self):
         file_path = filedialog.askopenfilename(
@@ -718,7 +1040,7 @@ class MermaidConverterGUI:
         )
         if file_path:
             self.config_file_var.set(file_path)
-            self.logger.info(f"Config file selected: {file_path}")
+            self.logger.info("Config file selected: %s", file_path)
 
     # --- Config File Actions ---
     # (create_default_config_file, edit_config_file remain the same)
@@ -741,7 +1063,7 @@ class MermaidConverterGUI:
                         parent=self.root,
                     )
             except Exception as e:
-                self.logger.error(f"Error creating default config: {e}", exc_info=True)
+                self.logger.error("Error creating default config: %s", e, exc_info=True)
                 messagebox.showerror(
                     "Error", f"Could not save config:\n{e}", parent=self.root
                 )
@@ -764,57 +1086,110 @@ class MermaidConverterGUI:
                 self.create_default_config_file()
             return
         try:
-            self.logger.info(f"Opening '{abs_config_path}' in default editor...")
+            self.logger.info("Opening '%s' in default editor...", abs_config_path)
             if sys.platform.startswith("win"):
                 os.startfile(abs_config_path)
-            elif sys.platform.startswith("darwin"):
-                os.system(f'open "{abs_config_path}"')
             else:
-                os.system(f'xdg-open "{abs_config_path}"')
+                # Launch without a shell and without waiting for the opener to exit
+                opener = "open" if sys.platform.startswith("darwin") else "xdg-open"
+                subprocess.Popen(
+                    [opener, abs_config_path],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
         except Exception as e:
-            self.logger.error(f"Error opening config file: {e}", exc_info=True)
+            self.logger.error("Error opening config file: %s", e, exc_info=True)
             messagebox.showerror(
                 "Error", f"Could not open config file:\n{e}", parent=self.root
             )
 
     # --- Logging and Status Updates ---
-    # (log_message_to_gui, process_log_queue remain the same)
-    def log_message_to_gui(self, message, level=logging.INFO):
-        if not hasattr(self, "log_text") or not self.log_text.winfo_exists():
+    # (process_log_queue remains the same)
+    def _flush_log_batch(self, batch):
+        """Writes a batch of (message, level tag) pairs to the log widget."""
+        if not self._alive:
             return
+        # Consecutive lines with the same tag are joined into one string, and
+        # Text.insert takes alternating chars/tags, so the batch is one Tcl call
+        insert_args = []
+        run_lines = []
+        run_tag = None
+        for message, level_name in batch:
+            if level_name != run_tag and run_lines:
+                insert_args.append("".join(run_lines))
+                insert_args.append((run_tag,))
+                run_lines = []
+            run_tag = level_name
+            run_lines.append(message if message.endswith("\n") else message + "\n")
+        if run_lines:
+            insert_args.append("".join(run_lines))
+            insert_args.append((run_tag,))
         try:
             self.log_text.config(state=tk.NORMAL)
-            level_name = logging.getLevelName(level)
-            self.log_text.insert(
-                tk.END, message + ("" if message.endswith("\n") else "\n"), level_name
-            )
+            self.log_text.insert(tk.END, *insert_args)
+            self._trim_log_text()
             self.log_text.see(tk.END)
             self.log_text.config(state=tk.DISABLED)
         except Exception as e:
             print(f"GUI Log Error: {e}", file=sys.stderr)
 
-    def process_log_queue(self):
+    def _trim_log_text(self):
+        """
+        Deletes the oldest lines once the log widget exceeds LOG_MAX_LINES.
+        Expects the widget to be in NORMAL state (called from _flush_log_batch).
+        """
+        line_count = int(self.log_text.index("end-1c").split(".")[0])
+        if line_count > LOG_MAX_LINES:
+            self.log_text.delete("1.0", f"{line_count - LOG_TRIM_TO_LINES}.0")
+
+    def _stop_log_listener(self):
+        """
+        Stops the QueueListener. The listener thread may be waiting on this
+        thread to run an event_generate call, so Tk keeps servicing events
+        while the listener shuts down instead of blocking in a bare join().
+        """
+        self.log_sink.notify = None
+        stopper = threading.Thread(target=self.log_listener.stop, daemon=True)
+        stopper.start()
+        while stopper.is_alive():
+            self.root.update()
+            stopper.join(0.01)
+
+    def _enable_log_events(self):
+        """Lets the log sink wake the GUI via <<LogEvent>> (needs a running main loop)."""
+        self.log_sink.notify = lambda: self.root.event_generate(
+            "<<LogEvent>>", when="tail"
+        )
+
+    def _drain_log_queue(self):
+        """Moves pending log lines from gui_log_deque into the log widget."""
+        # Cleared first so lines queued during the drain post a fresh event
+        self.log_sink.pending.clear()
+        if not self._alive:
+            return
+        batch = []
+        append = batch.append
+        popleft = gui_log_deque.popleft
         try:
-            while True:
-                record = log_queue.get_nowait()
-                formatted_msg = (
-                    record.handler.formatter.format(record)
-                    if hasattr(record, "handler")
-                    and hasattr(record.handler, "formatter")
-                    else f"{record.levelname}: {record.getMessage()}"
-                )
-                if hasattr(self, "root") and self.root.winfo_exists():
-                    self.root.after(
-                        0, self.log_message_to_gui, formatted_msg, record.levelno
-                    )
-                if hasattr(record, "handler"):
-                    del record.handler
-        except queue.Empty:
+            # Capped per pass to bound GUI latency; the rest waits for the next pass
+            for _ in range(LOG_BATCH_MAX):
+                append(popleft())
+        except IndexError:
             pass
         except Exception as e:
             print(f"Error processing log queue: {e}", file=sys.stderr)
-        if hasattr(self, "root") and self.root.winfo_exists():
-            self.root.after(100, self.process_log_queue)
+        if batch:
+            self._flush_log_batch(batch)
+        if len(batch) == LOG_BATCH_MAX:
+            self.root.after_idle(self._drain_log_queue)
+
+    def process_log_queue(self):
+        """Watchdog poll in case a <<LogEvent>> could not be posted."""
+        if not self._alive:
+            return
+        self._drain_log_queue()
+        self.root.after(LOG_WATCHDOG_MS, self.process_log_queue)
 
     # --- Conversion Process Management ---
     def start_conversion(self):
@@ -826,21 +1201,36 @@ class MermaidConverterGUI:
                 "Busy", "Conversion already in progress.", parent=self.root
             )
             return
+        # Snapshot every Tk variable once; each .get() is a Tcl round-trip
         file_path = self.file_path_var.get()
+        image_prefix = self.image_prefix_var.get()
+        selected_method = self.converter_method_var.get()
+        kroki_url = self.kroki_url_var.get()
+        image_format = self.image_format_var.get()
+        image_dir = self.image_dir_var.get()
+        config_path = self.config_file_var.get()
+        use_markdown_style = self.use_markdown_style_var.get()
+        output_suffix = self.output_suffix_var.get()
+        move_original = self.move_original_var.get()
+        add_readme = self.add_readme_var.get()
         if not file_path:
             messagebox.showerror(
                 "Input Error", "Please select input file.", parent=self.root
             )
             return
         abs_file_path = os.path.abspath(file_path)
-        if not os.path.isfile(abs_file_path):
+        try:
+            # Single stat covers both existence and "is a regular file"
+            is_regular_file = stat.S_ISREG(os.stat(abs_file_path).st_mode)
+        except OSError:
+            is_regular_file = False
+        if not is_regular_file:
             messagebox.showerror(
                 "Input Error",
                 f"Input file not found:\n{abs_file_path}",
                 parent=self.root,
             )
             return
-        image_prefix = self.image_prefix_var.get()
         invalid_chars = r'<>:"/\|?*'
         if any(c in invalid_chars for c in image_prefix):
             messagebox.showerror(
@@ -855,7 +1245,6 @@ class MermaidConverterGUI:
             )
             return
 
-        selected_method = self.converter_method_var.get()
         if selected_method == "library" and not MERMAID_AVAILABLE:
             messagebox.showerror(
                 "Dependency Error",
@@ -864,16 +1253,14 @@ class MermaidConverterGUI:
             )
             return
         if selected_method == "kroki":
-            try:
-                import requests
-            except ImportError:
+            if not _check_requests_available():
                 messagebox.showerror(
                     "Dependency Error",
                     "'Kroki' method requires 'requests' package.",
                     parent=self.root,
                 )
                 return
-            kroki_url_val = self.kroki_url_var.get() or DEFAULT_KROKI_URL
+            kroki_url_val = kroki_url or DEFAULT_KROKI_URL
             if not kroki_url_val.startswith(("http://", "https://")):
                 messagebox.showerror(
                     "Input Error",
@@ -889,7 +1276,7 @@ class MermaidConverterGUI:
             self.log_text.config(state=tk.DISABLED)
         except tk.TclError:
             pass
-        self.logger.info("=" * 25 + " Starting Conversion " + "=" * 25)
+        self.logger.info(_BANNER_START)
         self.convert_button.config(state=tk.DISABLED)
         self.progress.pack(side=tk.LEFT, padx=(5, 10), pady=2)
         self.progress.start(10)
@@ -897,79 +1284,106 @@ class MermaidConverterGUI:
         self.is_processing = True
 
         # --- Gather Options --- (Includes method and kroki_url)
-        options = {
-            "method": selected_method,  # Get selected method
-            "kroki_url": self.kroki_url_var.get() or None,  # Get Kroki URL
-            "image_prefix": self.image_prefix_var.get() or "diagram",
-            "image_format": self.image_format_var.get(),
-            "image_dir": self.image_dir_var.get() or None,
-            "config_path_input": self.config_file_var.get() or None,
-            "use_html_wrapper": not self.use_markdown_style_var.get(),
-            "output_suffix": self.output_suffix_var.get(),
-            "move_original_requested": self.move_original_var.get(),
-            "add_readme_requested": self.add_readme_var.get(),
-        }
+        options = ConversionOptions(
+            method=selected_method,  # Get selected method
+            kroki_url=kroki_url or None,  # Get Kroki URL
+            image_prefix=image_prefix or "diagram",
+            image_format=image_format,
+            image_dir=image_dir or None,
+            config_path_input=config_path or None,
+            use_html_wrapper=not use_markdown_style,
+            output_suffix=output_suffix,
+            move_original_requested=move_original,
+            add_readme_requested=add_readme,
+        )
 
         # --- Start Background Thread ---
         self.logger.info(
-            f"Starting conversion in background thread (Method: {selected_method})..."
+            "Starting conversion in background thread (Method: %s)...", selected_method
         )
-        conversion_thread = threading.Thread(
-            target=self.run_conversion_thread,
-            args=(abs_file_path, options),
-            daemon=True,
+        future = self._conversion_worker.submit(
+            self.run_conversion_thread, abs_file_path, options
         )
-        conversion_thread.start()
+        future.add_done_callback(self._on_conversion_done)
 
     def run_conversion_thread(self, abs_file_path, options):
-        """Worker function executed in background. Calls process_markdown_file."""
-        self.logger.debug(
-            f"Background thread started for {os.path.basename(abs_file_path)}"
-        )
+        """
+        Worker function executed on the ConversionWorker thread. Calls
+        process_markdown_file and returns the stats dict for the GUI thread.
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Background thread started for %s", os.path.basename(abs_file_path)
+            )
         stats = {}
         try:
+            # Config is read here, on the worker, never on the Tk thread
+            diagram_config = load_diagram_config(options.config_path_input)
             # *** Call the updated process_markdown_file from converter.py ***
             stats = process_markdown_file(
                 file_path=abs_file_path,
-                method=options["method"],  # Pass method
-                kroki_url=options["kroki_url"],  # Pass kroki_url
-                image_prefix=options["image_prefix"],
-                image_format=options["image_format"],
-                image_dir=options["image_dir"],
-                config_path_input=options["config_path_input"],
-                use_html_wrapper=options["use_html_wrapper"],
-                output_suffix=options["output_suffix"],
+                method=options.method,  # Pass method
+                kroki_url=options.kroki_url,  # Pass kroki_url
+                image_prefix=options.image_prefix,
+                image_format=options.image_format,
+                image_dir=options.image_dir,
+                diagram_config=diagram_config,
+                config_path_input=options.config_path_input,
+                use_html_wrapper=options.use_html_wrapper,
+                output_suffix=options.output_suffix,
             )
             # Add back flags needed only by GUI thread for file ops
-            stats["move_original_requested"] = options["move_original_requested"]
-            stats["add_readme_requested"] = options["add_readme_requested"]
-            stats["image_format"] = options["image_format"]  # Needed for readme content
-            self.logger.debug(
-                "process_markdown_file completed. Scheduling GUI result handler."
-            )
+            stats["move_original_requested"] = options.move_original_requested
+            stats["add_readme_requested"] = options.add_readme_requested
+            stats["image_format"] = options.image_format  # Needed for readme content
+            self.logger.debug("process_markdown_file completed.")
         except Exception as e:
             thread_error_msg = f"Unexpected error during conversion: {str(e)}"
             self.logger.critical(thread_error_msg, exc_info=True)
             stats["error"] = thread_error_msg
             stats["all_conversions_successful"] = False
             stats.setdefault("input_file_path", abs_file_path)  # Ensure keys exist
-            stats.setdefault(
-                "move_original_requested", options["move_original_requested"]
-            )
-            stats.setdefault("add_readme_requested", options["add_readme_requested"])
-            stats.setdefault("image_format", options["image_format"])
-        finally:
-            # Schedule GUI update
-            if hasattr(self, "root") and self.root.winfo_exists():
-                self.root.after(0, self.handle_conversion_result, stats)
-            else:
-                self.logger.warning("GUI closed before conversion thread finished.")
+            stats.setdefault("move_original_requested", options.move_original_requested)
+            stats.setdefault("add_readme_requested", options.add_readme_requested)
+            stats.setdefault("image_format", options.image_format)
+        return stats
+
+    def _post_to_gui(self, callback, *args):
+        """
+        Queues callback(*args) to run on the Tk thread. Called from worker
+        threads; only the first post of a burst schedules an after_idle flush.
+        """
+        if not self._alive:
+            return  # Shutting down; the Tk thread may be waiting on this thread
+        self._gui_mailbox.append((callback, args))
+        if not self._gui_pending:
+            self._gui_pending = True
+            self.root.after_idle(self._flush_mailbox)
+
+    def _flush_mailbox(self):
+        """Runs every queued worker callback in a single Tk idle pass."""
+        self._gui_pending = False  # Reset before draining so new posts reschedule
+        while True:
+            try:
+                callback, args = self._gui_mailbox.popleft()
+            except IndexError:
+                break
+            callback(*args)
+
+    def _on_conversion_done(self, future):
+        """Done-callback for the conversion future; schedules the GUI result handler."""
+        if future.cancelled():
+            return  # Shut down before the conversion started
+        if self._alive:
+            self._post_to_gui(self.handle_conversion_result, future.result())
+        else:
+            self.logger.warning("GUI closed before conversion thread finished.")
 
     # (handle_conversion_result remains the same logic, uses stats dict)
     def handle_conversion_result(self, stats):
         self.logger.debug("Running handle_conversion_result callback.")
         if stats.get("error") and not stats.get("total_diagrams", 0) > 0:
-            self.logger.error(f"Conversion failed early: {stats['error']}")
+            self.logger.error("Conversion failed early: %s", stats["error"])
             self._reset_ui_state()
             messagebox.showerror(
                 "Conversion Failed",
@@ -986,7 +1400,7 @@ class MermaidConverterGUI:
         else:
             failed_count = stats.get("failed_conversions", "Some")
             error_msg = stats.get("error", f"{failed_count} diagram(s) failed.")
-            self.logger.warning(f"{error_msg}. Prompting user.")
+            self.logger.warning("%s. Prompting user.", error_msg)
             user_choice = messagebox.askyesno(
                 "Conversion Issues",
                 f"{error_msg}\n\nProceed anyway? (Saves partial output)\n\n'No' will roll back changes.",
@@ -998,117 +1412,193 @@ class MermaidConverterGUI:
                 proceed_action = True
             else:
                 self.logger.warning("User chose to roll back changes.")
+                # Rollback deletes run on the Tk thread; no animation redraws meanwhile
+                self.progress.stop()
                 _rollback_images(stats.get("generated_image_paths", []))
                 stats["rolled_back"] = True
                 self.conversion_completed(stats)
                 return  # Stop processing
 
         if proceed_action:
-            self.logger.info("Performing final file operations...")
-            output_written = False
-            if stats.get("new_content") and stats.get("output_file_path"):
-                output_written = _write_output_file(
-                    stats["output_file_path"], stats["new_content"]
-                )
-            else:
-                self.logger.error(
-                    "Cannot write output: Missing new content or output path."
+            # File I/O runs on the conversion worker; the Tk thread stays responsive
+            future = self._conversion_worker.submit(self._finalize_conversion, stats)
+            future.add_done_callback(self._on_finalize_done)
+
+    def _finalize_conversion(self, stats):
+        """
+        Runs on the conversion worker after the user agreed to proceed.
+        Writes the output file and queues the move/readme step, then reports
+        back to the GUI thread.
+        """
+        self.logger.info("Performing final file operations...")
+        output_path = stats.get("output_file_path")
+        new_content = stats.get("new_content")
+        move_requested = stats.get("move_original_requested")
+        output_written = False
+        # Problems are collected here and shown in one dialog by conversion_completed
+        ui_errors = stats.setdefault("ui_errors", [])
+        if new_content and output_path:
+            output_written = _write_output_file(output_path, new_content)
+            if not output_written:
+                ui_errors.append(
+                    ("File Error", f"Failed to write output file:\n{output_path}")
                 )
+        else:
+            self.logger.error(
+                "Cannot write output: Missing new content or output path."
+            )
+            ui_errors.append(
+                ("File Error", "Cannot write output: missing content or output path.")
+            )
 
-            stats["original_moved"] = False
-            stats["readme_added"] = False
-            stats["move_dest_dir"] = ""
-            if output_written and stats.get("move_original_requested"):
-                original_path = stats["input_file_path"]
-                output_md_dir = os.path.dirname(original_path)
-                move_dest_dir = os.path.join(output_md_dir, MERMAID_VERSION_DIR)
-                output_filename = os.path.basename(stats["output_file_path"])
-                image_format = stats.get("image_format", "svg")
-                moved, readme = _move_original_and_readme(
+        stats["original_moved"] = False
+        stats["readme_added"] = False
+        stats["move_dest_dir"] = ""
+        if output_written and move_requested:
+            original_path = stats["input_file_path"]
+            # Parse each path once; str() only at the _move_original_and_readme boundary
+            move_dest_dir = str(PurePath(original_path).parent / MERMAID_VERSION_DIR)
+            output_filename = PurePath(output_path).name
+            image_format = stats.get("image_format", "svg")
+            # Move + readme run on the writer thread; it reports back when done
+            queued = self.artifact_writer.submit(
+                lambda: self._move_original_in_background(
+                    stats,
                     original_path,
                     move_dest_dir,
-                    stats.get("add_readme_requested", False),
                     output_filename,
                     image_format,
                 )
-                stats["original_moved"] = moved
-                stats["readme_added"] = readme
-                stats["move_dest_dir"] = move_dest_dir if moved else ""
-            elif not output_written:
-                self.logger.error("Skipping move/readme: output write failed.")
-            elif not stats.get("move_original_requested"):
-                self.logger.info("Skipping move/readme: not requested.")
-            self.conversion_completed(stats)  # Show final summary
+            )
+            if not queued:
+                self.logger.warning(
+                    "Application closing; original file was not moved: %s",
+                    original_path,
+                )
+            return
+        elif not output_written:
+            self.logger.error("Skipping move/readme: output write failed.")
+        elif not move_requested:
+            self.logger.info("Skipping move/readme: not requested.")
+        if self._alive:
+            self._post_to_gui(self.conversion_completed, stats)  # Show final summary
+
+    def _on_finalize_done(self, future):
+        """
+        Done-callback for _finalize_conversion. A normal run reports through
+        conversion_completed; this handles a crash, which would otherwise
+        leave is_processing set and the Convert button disabled.
+        """
+        if future.cancelled() or future.exception() is None:
+            return
+        finalize_err = future.exception()
+        self.logger.error(
+            "Final file operations failed: %s", finalize_err, exc_info=finalize_err
+        )
+        if self._alive:
+            self._post_to_gui(self._finalize_failed, finalize_err)
+
+    def _finalize_failed(self, finalize_err):
+        """Unlocks the UI and reports a crash in _finalize_conversion."""
+        self._reset_ui_state()
+        messagebox.showerror(
+            "Error", f"Final file operations failed:\n{finalize_err}", parent=self.root
+        )
+
+    def _move_original_in_background(
+        self, stats, original_path, move_dest_dir, output_filename, image_format
+    ):
+        """Runs on the ArtifactWriter thread. Moves the original, then shows the summary."""
+        moved, readme = _move_original_and_readme(
+            original_path,
+            move_dest_dir,
+            stats.get("add_readme_requested", False),
+            output_filename,
+            image_format,
+        )
+        stats["original_moved"] = moved
+        stats["readme_added"] = readme
+        stats["move_dest_dir"] = move_dest_dir if moved else ""
+        if not moved:
+            stats.setdefault("ui_errors", []).append(
+                ("Move Error", f"Failed to move original file to:\n{move_dest_dir}")
+            )
+        elif stats.get("add_readme_requested", False) and not readme:
+            stats.setdefault("ui_errors", []).append(
+                ("Readme Error", f"Failed to create readme.md in:\n{move_dest_dir}")
+            )
+        if self._alive:
+            self._post_to_gui(self.conversion_completed, stats)
 
     # (_reset_ui_state remains the same)
     def _reset_ui_state(self):
-        if hasattr(self, "progress") and self.progress.winfo_exists():
-            self.progress.stop()
-            self.progress.pack_forget()
-        if hasattr(self, "convert_button") and self.convert_button.winfo_exists():
-            self.convert_button.config(state=tk.NORMAL)
         self.is_processing = False
-        if hasattr(self, "status_var"):
-            self.status_var.set("Ready.")
+        if not self._alive:
+            return
+        self.progress.stop()
+        self.progress.pack_forget()
+        self.convert_button.config(state=tk.NORMAL)
+        self.status_var.set("Ready.")
 
     # (conversion_completed remains the same logic, uses stats dict)
     def conversion_completed(self, stats):
-        if not hasattr(self, "root") or not self.root.winfo_exists():
+        if not self._alive:
             self.logger.warning("GUI closed before completion callback.")
             return
         self.logger.debug("Running conversion_completed callback.")
         self._reset_ui_state()
-        total = stats.get("total_diagrams", 0)
-        success_count = stats.get("successful_conversions", 0)
-        failed_count = stats.get("failed_conversions", 0)
-        output_file = stats.get("output_file_path", "N/A")
-        image_dir = stats.get("image_directory", "N/A")
-        moved = stats.get("original_moved", False)
-        readme = stats.get("readme_added", False)
-        move_dest = stats.get("move_dest_dir", "")
-        rolled_back = stats.get("rolled_back", False)
-        self.logger.info("=" * 25 + " Process Finished " + "=" * 25)
-        summary_log = f"""
-------------------- Process Summary -------------------
-Input File:           {stats.get('input_file_path', 'N/A')}
-Converter Used:       {stats.get('method_used', 'N/A')}
-Output File:          {output_file if not rolled_back else 'N/A (Rolled Back)'}
-Image Directory:      {image_dir}
-Diagrams Found:       {total}
-Successfully Converted: {success_count}
-Failed Conversions:   {failed_count}
-Rolled Back:          {'Yes' if rolled_back else 'No'}
-Original Moved:       {'Yes (' + move_dest + ')' if moved else 'No'}
-README Added:         {'Yes' if readme else 'No'}
-----------------------------------------------------------"""
+        get = stats.get  # Each key is looked up exactly once below
+        total = get("total_diagrams", 0)
+        failed_count = get("failed_conversions", 0)
+        output_file = get("output_file_path", "N/A")
+        moved = get("original_moved", False)
+        readme = get("readme_added", False)
+        move_dest = get("move_dest_dir", "")
+        rolled_back = get("rolled_back", False)
+        self.logger.info(_BANNER_END)
+        summary_fields = dict(SUMMARY_DEFAULTS)
+        summary_fields.update(stats)
+        summary_fields.update(
+            output_display=output_file if not rolled_back else "N/A (Rolled Back)",
+            rolled_back_display="Yes" if rolled_back else "No",
+            moved_display=f"Yes ({move_dest})" if moved else "No",
+            readme_display="Yes" if readme else "No",
+        )
+        summary_log = SUMMARY_TEMPLATE.format_map(summary_fields)
         self.logger.info(summary_log)
         final_status = "Finished."
         msg_title = "Complete"
         msg_type = messagebox.showinfo
         if rolled_back:
             final_status = f"Failed - Rolled back ({failed_count} errors)."
-            message = f"{failed_count} diagram(s) failed.\n\nChanges rolled back."
+            parts = [f"{failed_count} diagram(s) failed.\n\nChanges rolled back."]
             msg_title = "Rolled Back"
             msg_type = messagebox.showwarning
         elif total == 0:
             final_status = "Finished. No diagrams found."
-            message = "Processing finished.\nNo Mermaid diagrams found."
+            parts = ["Processing finished.\nNo Mermaid diagrams found."]
         elif failed_count > 0:
             final_status = f"Completed with {failed_count} errors."
-            message = f"Processing finished, but {failed_count} diagram(s) failed (check log)."
+            parts = [
+                f"Processing finished, but {failed_count} diagram(s) failed (check log)."
+            ]
             msg_title = "Partial Success"
             msg_type = messagebox.showwarning
         else:
             final_status = "Conversion completed successfully!"
-            message = "Conversion completed successfully!"
-        if not rolled_back and failed_count > 0 and moved:
-            message += f"\nOriginal file moved to:\n{move_dest}"
-        if not rolled_back and failed_count > 0 and readme:
-            message += "\nREADME.md added."
-        if not rolled_back and failed_count == 0 and moved:
-            message += f"\nOriginal file moved to:\n{move_dest}"
-        if not rolled_back and failed_count == 0 and readme:
-            message += "\nREADME.md added."
+            parts = ["Conversion completed successfully!"]
+        if not rolled_back and moved:
+            parts.append(f"Original file moved to:\n{move_dest}")
+        if not rolled_back and readme:
+            parts.append("README.md added.")
+        ui_errors = get("ui_errors")
+        if ui_errors:
+            # One combined dialog instead of a modal per failure
+            final_status = f"Finished with {len(ui_errors)} file error(s)."
+            parts.append("\n" + "\n\n".join(e[1] for e in ui_errors))
+            msg_title = ui_errors[0][0] if len(ui_errors) == 1 else "File Errors"
+            msg_type = messagebox.showerror
+        message = "\n".join(parts)
         self.status_var.set(final_status)
         msg_type(msg_title, message, parent=self.root)
 
@@ -1117,15 +1607,22 @@ README Added:         {'Yes' if readme else 'No'}
 def main():
     """Sets up logging and starts the Tkinter GUI application."""
     root = tk.Tk()
+    app = None
     try:
         app = MermaidConverterGUI(root)
         root.mainloop()
     except KeyboardInterrupt:
         print("\nApplication interrupted.")
     except Exception as main_err:
+        import traceback
+
         print(f"\nFATAL ERROR: {main_err}", file=sys.stderr)
-        traceback.print_exc()
+        traceback.print_exception(main_err)
         sys.exit(1)
+    finally:
+        # Also covers mainloop exiting without going through _shutdown (e.g. Ctrl+C)
+        if app is not None:
+            app.close()
 
 
 # --- Script Execution Guard ---
@@ -1135,6 +1632,8 @@ if __name__ == "__main__":
     except SystemExit:
         pass
     except Exception as e:
+        import traceback
+
         print(f"\nCRITICAL FAILURE: {e}", file=sys.stderr)
-        traceback.print_exc()
+        traceback.print_exception(e)
         sys.exit(1)
@@ -1,94 +1,80 @@
 import argparse
-import json
+import atexit
+import errno
+import functools
 import logging
+import logging.handlers
 import os
-import shutil
+import queue
+import stat
 import sys
-import traceback
 from pathlib import Path
 
-# --- Import Core Logic ---
-# We now primarily need process_markdown_file from the updated converter
-try:
-    from converter import (
-        CONVERTER_AVAILABLE,
-    )  # General check if converter module loaded
-    from converter import (
-        MERMAID_AVAILABLE,
-    )  # Check if library is available for validation
-    from converter import (
-        load_diagram_config,
-    )  # Still needed for --create-config potentially
-    from converter import process_markdown_file
-
-    # Note: We no longer need to import the specific generation functions here
-except ImportError:
-    print(
-        "ERROR: Failed to import 'converter' module. Cannot continue.", file=sys.stderr
-    )
-    # Define dummy functions to prevent NameErrors if import fails, though script should exit
-    CONVERTER_AVAILABLE = False
-    MERMAID_AVAILABLE = False
-
-    def process_markdown_file(**kwargs):
-        return {
-            "error": "Converter module not found.",
-            "all_conversions_successful": False,
-        }
-
-    def load_diagram_config(p=None):
-        return {}
-
-except Exception as import_err:
-    print(
-        f"ERROR: Unexpected error importing 'converter': {import_err}", file=sys.stderr
-    )
-    traceback.print_exc()
-    CONVERTER_AVAILABLE = False
-    MERMAID_AVAILABLE = False
-
-    def process_markdown_file(**kwargs):
-        return {
-            "error": "Converter import failed.",
-            "all_conversions_successful": False,
-        }
-
-    def load_diagram_config(p=None):
-        return {}
-
-
 # --- Constants ---
 DEFAULT_CONFIG_FILENAME = "diagram_config.json"
 DEFAULT_OUTPUT_SUFFIX = "-img"  # Default suffix for the output markdown file
 LOG_FILENAME = "mermaid_converter.log"  # Log file name
 MERMAID_VERSION_DIR = "mermaid_version"  # Subdirectory for moved original files
 DEFAULT_KROKI_URL = "http://localhost:8000"  # Default Kroki instance URL
+OUTPUT_ENCODE_CHUNK = 1 << 16  # Characters encoded per step when writing output
+OUTPUT_WRITE_BUFFER = 1 << 20  # Bytes buffered per write() of the output file
+LOG_BUFFER_CAPACITY = 1024  # Log records buffered in memory before a file flush
+# Default diagram config, pre-serialized (same structure as converter.py's
+# load_diagram_config defaults; matches json.dump(..., indent=2) output)
+_DEFAULT_CONFIG_BYTES = (
+    b"{\n"
+    b'  "default": {\n    "max_width": "600px"\n  },\n'
+    b'  "flowchart": {\n    "max_width": "650px"\n  },\n'
+    b'  "sequence": {\n    "max_width": "550px"\n  }\n'
+    b"}"
+)
+
+# File logging pipeline, set by setup_logger: QueueHandler on the root logger ->
+# _file_log_listener thread -> _file_log_buffer (MemoryHandler) -> FileHandler
+_file_log_listener = None
+_file_log_buffer = None
+# Set once setup_logger has installed its handlers; later calls return early
+_LOGGER_CONFIGURED = False
+# The converter module, imported on first use by _get_converter
+_converter = None
+
+# Module loggers, looked up once instead of on every helper call
+_LOG = logging.getLogger(__name__)
+_CREATE_CFG_LOG = logging.getLogger(__name__ + ".create_default_config")
 
 
 # --- Logger Setup ---
-def setup_logger():
-    """Configures the root logger for command-line usage."""
+def _close_file_log():
+    """Stops the file log listener and flushes its buffer. Safe to call twice."""
+    global _file_log_listener, _file_log_buffer
+    if _file_log_listener is not None:
+        _file_log_listener.stop()  # Drains records still queued
+        _file_log_listener = None
+    if _file_log_buffer is not None:
+        _file_log_buffer.close()  # Pushes buffered records to the log file
+        _file_log_buffer = None
+
+
+def setup_logger(force=False):
+    """
+    Configures the root logger for command-line usage. Existing root handlers
+    are left alone unless force=True, which removes them and reconfigures.
+    """
+    global _file_log_listener, _file_log_buffer, _LOGGER_CONFIGURED
     root_logger = logging.getLogger()
     # Avoid reconfiguring if already set up (e.g., if called multiple times)
-    if (
-        any(isinstance(h, logging.StreamHandler) for h in root_logger.handlers)
-        and any(
-            isinstance(h, logging.FileHandler)
-            and os.path.normpath(getattr(h, "baseFilename", ""))
-            == os.path.normpath(LOG_FILENAME)
-            for h in root_logger.handlers
-        )
-        and root_logger.level != logging.NOTSET
-    ):
-        return root_logger  # Already configured
+    if _LOGGER_CONFIGURED and not force:
+        return root_logger
 
-    # Remove existing handlers to prevent duplicates if re-run in same process
-    for handler in root_logger.handlers[:]:
-        try:
-            handler.close()
-            root_logger.removeHandler(handler)
-        except Exception:
-            pass  # Ignore errors during handler removal
+    if force:
+        # Remove existing handlers (ours or an embedder's) before reconfiguring
+        _close_file_log()
+        for handler in root_logger.handlers[:]:
+            try:
+                handler.close()
+                root_logger.removeHandler(handler)
+            except Exception:
+                pass  # Ignore errors during handler removal
 
     root_logger.setLevel(
         logging.DEBUG
@@ -110,53 +96,107 @@ def setup_logger():
         )  # Append mode
         file_handler.setFormatter(log_formatter)
         file_handler.setLevel(logging.DEBUG)
-        root_logger.addHandler(file_handler)
+        # Batch DEBUG records in memory; ERROR and above flush straight to disk
+        _file_log_buffer = logging.handlers.MemoryHandler(
+            LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True,
+        )
+        _file_log_buffer.setLevel(logging.DEBUG)
+        # Callers only enqueue; the listener thread does the file I/O
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(logging.DEBUG)
+        root_logger.addHandler(queue_handler)
+        _file_log_listener = logging.handlers.QueueListener(
+            log_queue, _file_log_buffer, respect_handler_level=True
+        )
+        _file_log_listener.start()
+        atexit.register(_close_file_log)
         root_logger.debug(
-            f"Root logger configured: Console (INFO+), File ('{LOG_FILENAME}', DEBUG+)."
+            "Root logger configured: Console (INFO+), File ('%s', DEBUG+).",
+            LOG_FILENAME,
         )
     except Exception as e:
         # Fallback if log file cannot be created
         root_logger.error(
-            f"Failed to create log file handler for {LOG_FILENAME}: {e}", exc_info=True
+            "Failed to create log file handler for %s: %s",
+            LOG_FILENAME,
+            e,
+            exc_info=True,
         )
         print(
             f"Error: Could not open log file {LOG_FILENAME}. Logging to console only.",
             file=sys.stderr,
         )
 
+    _LOGGER_CONFIGURED = True
     return root_logger
 
 
 # --- Helper Functions ---
+def _get_converter():
+    """
+    Imports converter.py on first use and caches the module. Only the file
+    processing path calls this, so --help, --gui and --create-config never load
+    converter's dependencies. Import errors propagate to the caller.
+    """
+    global _converter
+    if _converter is None:
+        import converter
+
+        _converter = converter
+    return _converter
+
+
+def _write_atomically(path, write_body, buffering=-1):
+    """
+    Calls write_body(f) on a binary '<path>.tmp' sibling, fsyncs it and then
+    os.replace()s it over path, so path is never left half-written. The temp
+    file is removed if anything fails.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb", buffering=buffering) as f:
+            write_body(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def create_default_config(output_path):
     """Creates a default diagram configuration JSON file."""
     # This function remains independent and uses its own logger instance if needed
-    func_logger = logging.getLogger(__name__ + ".create_default_config")
-    # Use the same default config structure as defined in converter.py's load_diagram_config
-    default_config = {
-        "default": {"max_width": "600px"},
-        "flowchart": {"max_width": "650px"},
-        "sequence": {"max_width": "550px"},
-        # Add other types if desired in the default file...
-    }
     abs_output_path = os.path.abspath(output_path)
     output_dir = os.path.dirname(abs_output_path)
-    func_logger.info(f"Attempting to create default config file at: {abs_output_path}")
+    _CREATE_CFG_LOG.info(
+        "Attempting to create default config file at: %s", abs_output_path
+    )
     try:
         # Ensure the target directory exists
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
-            func_logger.debug(f"Ensured directory exists: {output_dir}")
-        # Write the default config as JSON
-        with open(abs_output_path, "w", encoding="utf-8") as f:
-            json.dump(default_config, f, indent=2)  # Use indent for readability
-        func_logger.info(f"Successfully created default config file: {abs_output_path}")
+            _CREATE_CFG_LOG.debug("Ensured directory exists: %s", output_dir)
+        # Write the pre-serialized default config
+        _write_atomically(abs_output_path, lambda f: f.write(_DEFAULT_CONFIG_BYTES))
+        _CREATE_CFG_LOG.info(
+            "Successfully created default config file: %s", abs_output_path
+        )
         print(f"Default configuration file created at: {abs_output_path}")
         return True
     except OSError as dir_err:
         # Handle directory creation errors
-        func_logger.error(
-            f"Failed to create directory for config file {abs_output_path}: {dir_err}",
+        _CREATE_CFG_LOG.error(
+            "Failed to create directory for config file %s: %s",
+            abs_output_path,
+            dir_err,
             exc_info=True,
         )
         print(
@@ -165,8 +205,8 @@ def create_default_config(output_path):
         return False
     except Exception as e:
         # Handle file writing or other errors
-        func_logger.error(
-            f"Error creating config file at {abs_output_path}: {e}", exc_info=True
+        _CREATE_CFG_LOG.error(
+            "Error creating config file at %s: %s", abs_output_path, e, exc_info=True
         )
         print(
             f"Error: Could not create config file at {abs_output_path}: {e}",
@@ -182,16 +222,20 @@ def create_default_config(output_path):
 
 def _cli_write_output_file(output_path, content):
     """Writes the processed markdown content to the specified output file."""
-    cli_logger = logging.getLogger(__name__)  # Use main logger
-    cli_logger.info(f"Attempting to write output file: {output_path}")
+    _LOG.info("Attempting to write output file: %s", output_path)
     try:
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
-        cli_logger.info(f"Successfully created output file: {output_path}")
+        # Encode in bounded chunks (no second full-size copy of the document) and
+        # let a large binary buffer coalesce them into few write() calls
+        def write_body(f):
+            for start in range(0, len(content), OUTPUT_ENCODE_CHUNK):
+                f.write(content[start : start + OUTPUT_ENCODE_CHUNK].encode("utf-8"))
+
+        _write_atomically(output_path, write_body, buffering=OUTPUT_WRITE_BUFFER)
+        _LOG.info("Successfully created output file: %s", output_path)
         return True
     except Exception as write_err:
-        cli_logger.error(
-            f"Failed to write output file {output_path}: {write_err}", exc_info=True
+        _LOG.error(
+            "Failed to write output file %s: %s", output_path, write_err, exc_info=True
         )
         print(f"Error: Failed to write output file {output_path}", file=sys.stderr)
         return False
@@ -202,54 +246,63 @@ def _cli_move_original_and_readme(
 ):
     """
     Moves the original markdown file to a subdirectory and optionally adds a README.md.
+    Path arguments may be str or Path.
     """
-    cli_logger = logging.getLogger(__name__)
+    original_path = Path(original_path)
+    move_dest_dir = Path(move_dest_dir)
     original_moved = False
     readme_added = False
     try:
         # Ensure the destination directory (e.g., 'mermaid_version/') exists
         os.makedirs(move_dest_dir, exist_ok=True)
-        cli_logger.info(
-            f"Ensured '{os.path.basename(move_dest_dir)}' directory exists: {move_dest_dir}"
+        _LOG.info(
+            "Ensured '%s' directory exists: %s", move_dest_dir.name, move_dest_dir
         )
 
         # Construct the destination path for the original file
-        original_filename = os.path.basename(original_path)
-        move_dest_path = os.path.join(move_dest_dir, original_filename)
+        original_filename = original_path.name
+        move_dest_path = move_dest_dir / original_filename
 
         # Move the file
-        cli_logger.info(
-            f"Attempting to move original file '{original_path}' to '{move_dest_path}'"
+        _LOG.info(
+            "Attempting to move original file '%s' to '%s'",
+            original_path,
+            move_dest_path,
         )
-        shutil.move(original_path, move_dest_path)
-        cli_logger.info(f"Successfully moved original file to: {move_dest_path}")
+        try:
+            # Same directory tree, so normally a single atomic rename
+            os.replace(original_path, move_dest_path)
+        except OSError as rename_err:
+            if rename_err.errno != errno.EXDEV:
+                raise
+            import shutil  # Only needed on this rare path
+
+            shutil.move(original_path, move_dest_path)  # Cross-device fallback
+        _LOG.info("Successfully moved original file to: %s", move_dest_path)
         original_moved = True
 
         # Add README.md if requested and the move was successful
         if add_readme_flag:
-            readme_path = os.path.join(move_dest_dir, "readme.md")
+            readme_path = move_dest_dir / "readme.md"
             # Get original directory for context in readme
-            output_md_dir = os.path.dirname(original_path)
-            # Define README content
-            readme_content = (
-                f"This folder contains the original version ('{original_filename}') of a Markdown file "
-                "that included Mermaid diagrams.\n\n"
-                "The file was moved here because Mermaid diagrams may not render correctly "
-                "in all Markdown viewers or platforms.\n\n"
-                "A converted version of the file, with Mermaid diagrams rendered as images "
-                f"('{image_format.upper()}'), should be located in the parent directory ('{output_md_dir}') "
-                f"with the name '{output_file_name}'."
+            output_md_dir = original_path.parent
+            readme_content = _get_converter().README_TEMPLATE.format(
+                orig=original_filename,
+                fmt=image_format.upper(),
+                dir=output_md_dir,
+                out=output_file_name,
             )
             try:
                 # Write the README file
-                with open(readme_path, "w", encoding="utf-8") as rf:
-                    rf.write(readme_content)
-                cli_logger.info(f"Successfully created readme.md in {move_dest_dir}")
+                readme_path.write_text(readme_content, encoding="utf-8")
+                _LOG.info("Successfully created readme.md in %s", move_dest_dir)
                 readme_added = True
             except Exception as readme_err:
                 # Log error if README creation fails, but don't stop the process
-                cli_logger.error(
-                    f"Failed to create readme.md in {move_dest_dir}: {readme_err}",
+                _LOG.error(
+                    "Failed to create readme.md in %s: %s",
+                    move_dest_dir,
+                    readme_err,
                     exc_info=True,
                 )
                 print(
@@ -260,15 +313,20 @@ def _cli_move_original_and_readme(
 
     except OSError as move_os_err:
         # Error creating directory
-        cli_logger.error(
-            f"Failed to create directory '{move_dest_dir}': {move_os_err}",
+        _LOG.error(
+            "Failed to create directory '%s': %s",
+            move_dest_dir,
+            move_os_err,
             exc_info=True,
         )
         print(f"Error: Failed to create directory '{move_dest_dir}'", file=sys.stderr)
     except Exception as move_err:
         # Error during the actual file move operation
-        cli_logger.error(
-            f"Failed to move original file '{original_path}' to '{move_dest_dir}': {move_err}",
+        _LOG.error(
+            "Failed to move original file '%s' to '%s': %s",
+            original_path,
+            move_dest_dir,
+            move_err,
             exc_info=True,
         )
         print(f"Error: Failed to move original file '{original_path}'", file=sys.stderr)
@@ -279,32 +337,34 @@ def _cli_move_original_and_readme(
 
 def _cli_rollback_images(image_paths):
     """Deletes the list of generated image files during rollback."""
-    cli_logger = logging.getLogger(__name__)
-    cli_logger.warning("Rolling back changes: Deleting generated images...")
+    _LOG.warning("Rolling back changes: Deleting generated images...")
     deleted_count = 0
     if not image_paths:
-        cli_logger.warning(
-            "Rollback requested, but no images were generated or tracked."
-        )
+        _LOG.warning("Rollback requested, but no images were generated or tracked.")
         return 0  # Nothing to delete
 
+    # Bound methods hoisted out of the per-image loop
+    log_info = _LOG.info
+    log_warning = _LOG.warning
     # Iterate through the list of absolute image paths provided
     for img_path in image_paths:
         try:
-            # Check if the file exists before attempting deletion
-            if os.path.isfile(img_path):
-                os.remove(img_path)
-                cli_logger.info(f"Deleted image during rollback: {img_path}")
-                deleted_count += 1
-            else:
-                # Log if a file expected to be deleted was not found
-                cli_logger.warning(
-                    f"Image file not found during rollback (already deleted?): {img_path}"
-                )
+            # Unlink directly; a missing file surfaces as FileNotFoundError
+            os.unlink(img_path)
+            log_info("Deleted image during rollback: %s", img_path)
+            deleted_count += 1
+        except FileNotFoundError:
+            # Log if a file expected to be deleted was not found
+            log_warning(
+                "Image file not found during rollback (already deleted?): %s",
+                img_path,
+            )
         except OSError as del_err:
             # Log errors during deletion (e.g., permission issues)
-            cli_logger.error(
-                f"Failed to delete image during rollback {img_path}: {del_err}",
+            _LOG.error(
+                "Failed to delete image during rollback %s: %s",
+                img_path,
+                del_err,
                 exc_info=True,
             )
             print(
@@ -312,20 +372,18 @@ def _cli_rollback_images(image_paths):
                 file=sys.stderr,
             )
 
-    cli_logger.warning(
-        f"Rollback complete. Deleted {deleted_count}/{len(image_paths)} generated images."
+    _LOG.warning(
+        "Rollback complete. Deleted %s/%s generated images.",
+        deleted_count,
+        len(image_paths),
     )
     return deleted_count
 
 
-# --- Main Execution Logic ---
-def main():
-    """Main entry point for the command-line interface."""
-    # Setup logger for the application run
-    logger = setup_logger()
-    logger.debug("CLI Logger configured and main logger instance obtained.")
-
-    # --- Argument Parser Setup ---
+# --- Argument Parser Setup ---
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """Builds the CLI argument parser once; later main() calls reuse it."""
     parser = argparse.ArgumentParser(
         description="Convert Mermaid diagrams within Markdown files into linked images (SVG or PNG) using either the python-mermaid library or a Kroki instance.",
         epilog=(
@@ -422,14 +480,26 @@ def main():
         nargs="?",  # Argument is optional
         const=DEFAULT_CONFIG_FILENAME,  # Value if flag is given with no argument
     )
+    return parser
+
+
+# --- Main Execution Logic ---
+def main():
+    """Main entry point for the command-line interface."""
+    # Setup logger for the application run
+    logger = setup_logger()
+    logger.debug("CLI Logger configured and main logger instance obtained.")
+
+    # --- Argument Parser (built once, cached) ---
+    parser = _build_parser()
 
     # --- Parse Arguments ---
     try:
         args = parser.parse_args()
-        logger.debug(f"Parsed arguments: {args}")
+        logger.debug("Parsed arguments: %s", args)
     except Exception as parse_err:
         # Handle errors during argument parsing (e.g., invalid choices)
-        logger.error(f"Error parsing arguments: {parse_err}", exc_info=True)
+        logger.error("Error parsing arguments: %s", parse_err, exc_info=True)
         # parser.print_usage() # Optionally show usage
         sys.exit(2)  # Standard exit code for command line syntax errors
 
@@ -437,7 +507,7 @@ def main():
     # 1. Create Config Action
     if args.create_config is not None:
         logger.info(
-            f"Action: Create default config requested at '{args.create_config}'"
+            "Action: Create default config requested at '%s'", args.create_config
         )
         success = create_default_config(args.create_config)
         sys.exit(0 if success else 1)  # Exit after creating config
@@ -468,7 +538,7 @@ def main():
         except ImportError as import_err:
             # Handle error if gui.py itself cannot be imported
             logger.critical(
-                f"GUI launch failed (Import Error): {import_err}", exc_info=True
+                "GUI launch failed (Import Error): %s", import_err, exc_info=True
             )
             print(
                 f"Error: Failed to launch GUI. Could not import 'gui' module: {import_err}",
@@ -482,7 +552,7 @@ def main():
         except Exception as gui_err:
             # Handle unexpected errors during GUI execution
             logger.critical(
-                f"GUI launch failed (Runtime Error): {gui_err}", exc_info=True
+                "GUI launch failed (Runtime Error): %s", gui_err, exc_info=True
             )
             print(
                 f"Error: Unexpected problem starting or running the GUI: {gui_err}",
@@ -499,23 +569,46 @@ def main():
 
     input_file_path = args.file
     logger.info(
-        f"Action: Processing input file '{input_file_path}' via CLI using '{args.converter}' converter."
+        "Action: Processing input file '%s' via CLI using '%s' converter.",
+        input_file_path,
+        args.converter,
     )
 
     # Validate Input File Path
     abs_input_file_path = os.path.abspath(input_file_path)
-    if not os.path.isfile(abs_input_file_path):
-        logger.critical(f"Input file not found: {abs_input_file_path}")
+    try:
+        # Single stat covers both existence and "is a regular file"
+        is_regular_file = stat.S_ISREG(os.stat(abs_input_file_path).st_mode)
+    except OSError:
+        is_regular_file = False
+    if not is_regular_file:
+        logger.critical("Input file not found: %s", abs_input_file_path)
         print(f"Error: Input file not found: {abs_input_file_path}", file=sys.stderr)
         sys.exit(1)  # File not found error
     # Optional: Warn if not a .md file
-    if not abs_input_file_path.lower().endswith(".md"):
+    if os.path.splitext(abs_input_file_path)[1].lower() != ".md":
         logger.warning(
-            f"Input file '{abs_input_file_path}' may not be Markdown (.md extension missing)."
+            "Input file '%s' may not be Markdown (.md extension missing).",
+            abs_input_file_path,
+        )
+
+    # --- Import Core Logic ---
+    # Deferred until here so --help, --create-config and --gui never pay for it
+    converter = None
+    try:
+        converter = _get_converter()
+    except ImportError:
+        print(
+            "ERROR: Failed to import 'converter' module. Cannot continue.",
+            file=sys.stderr,
+        )
+    except Exception as import_err:
+        logger.critical(
+            "Unexpected error importing 'converter': %s", import_err, exc_info=True
         )
 
     # Check Core Converter Availability
-    if not CONVERTER_AVAILABLE:
+    if converter is None:
         # This check is slightly redundant if imports failed earlier, but good practice
         logger.critical(
             "Core converter logic ('converter.py') failed to load. Cannot process file."
@@ -527,7 +620,7 @@ def main():
         sys.exit(1)  # Dependency error
 
     # Check Specific Library Availability if chosen
-    if args.converter == "library" and not MERMAID_AVAILABLE:
+    if args.converter == "library" and not converter.MERMAID_AVAILABLE:
         logger.critical(
             "Converter set to 'library', but the python-mermaid library failed to load or is not installed."
         )
@@ -543,7 +636,7 @@ def main():
     stats = {}  # Initialize stats dict
     try:
         # Call the main processing function from converter.py, passing all relevant args
-        stats = process_markdown_file(
+        stats = converter.process_markdown_file(
             file_path=abs_input_file_path,
             method=args.converter,
             kroki_url=args.kroki_url,  # Pass Kroki URL (used only if method='kroki')
@@ -559,16 +652,24 @@ def main():
         )
 
         # --- Handle Results from process_markdown_file ---
+        # Keys used more than once below, looked up once
+        stats_error = stats.get("error")
+        output_path = stats.get("output_file_path")
+        method_used = stats.get("method_used", args.converter)
+        failed_conversions = stats.get("failed_conversions", 0)
         exit_code = 1  # Default to error exit code
         final_message = (
             "\nProcessing failed unexpectedly. Check logs."  # Default message
         )
         rolled_back = False  # Flag for rollback status
+        original_moved = False
+        readme_added = False
+        move_dest_dir_path = ""  # Store path for summary message
 
         # Check for critical errors reported by the converter
-        if stats.get("error"):
-            logger.error(f"Conversion failed early: {stats['error']}")
-            final_message = f"\nError: Could not process file: {stats['error']}"
+        if stats_error:
+            logger.error("Conversion failed early: %s", stats_error)
+            final_message = f"\nError: Could not process file: {stats_error}"
             # No files should have been written or moved in case of early error
 
         # Check if all conversions were successful
@@ -577,24 +678,20 @@ def main():
                 "All diagrams converted successfully. Performing file operations..."
             )
             # Write the output file using the content generated by the converter
-            output_written = _cli_write_output_file(
-                stats["output_file_path"], stats["new_content"]
-            )
+            output_written = _cli_write_output_file(output_path, stats["new_content"])
 
             # Handle moving the original file and adding README if requested
-            original_moved = False
-            readme_added = False
-            move_dest_dir_path = ""  # Store path for summary message
             if output_written and args.move_original:
-                # Determine the destination directory for the move
-                output_md_dir = os.path.dirname(abs_input_file_path)
-                move_dest_dir_path = os.path.join(output_md_dir, MERMAID_VERSION_DIR)
+                # Determine the destination directory for the move (parsed once)
+                input_path = Path(abs_input_file_path)
+                move_dest_dir = input_path.parent / MERMAID_VERSION_DIR
+                move_dest_dir_path = str(move_dest_dir)  # For the summary message
                 # Get the base name of the output file for the README
-                output_filename_base = os.path.basename(stats["output_file_path"])
+                output_filename_base = Path(output_path).name
                 # Perform the move and readme creation
                 original_moved, readme_added = _cli_move_original_and_readme(
-                    abs_input_file_path,  # Path to the original input file
-                    move_dest_dir_path,
+                    input_path,  # Path to the original input file
+                    move_dest_dir,
                     args.add_readme,
                     output_filename_base,
                     args.format,  # Pass image format for README content
@@ -619,9 +716,10 @@ def main():
         # --- Handle Partial Failure: Automatic Rollback for CLI ---
         else:
             # This block executes if process_markdown_file indicated some failures
-            failed_count = stats.get("failed_conversions", "Some")
+            failed_count = failed_conversions or "Some"
             logger.warning(
-                f"{failed_count} diagram(s) failed conversion. Rolling back changes for CLI."
+                "%s diagram(s) failed conversion. Rolling back changes for CLI.",
+                failed_count,
             )
             print(
                 f"\nWARNING: {failed_count} diagram(s) failed conversion. Rolling back changes.",
@@ -637,23 +735,25 @@ def main():
             exit_code = 1  # Indicate failure
 
         # --- Print Final Summary ---
-        print("\n--- Conversion Summary ---")
-        print(
-            f"Input File:           {stats.get('input_file_path', abs_input_file_path)}"
-        )
-        print(f"Converter Used:       {stats.get('method_used', args.converter)}")
-        if stats.get("method_used") == "kroki":
-            print(
-                f"Kroki URL:            {args.kroki_url}"
-            )  # Show URL if Kroki was used
-        print(
-            f"Output File:          {stats.get('output_file_path', 'N/A') if not rolled_back and exit_code == 0 else 'N/A (Not Created or Rolled Back)'}"
+        # Built up front and written in one call instead of a print() per line
+        output_display = (
+            (output_path or "N/A")
+            if not rolled_back and exit_code == 0
+            else "N/A (Not Created or Rolled Back)"
         )
-        print(f"Image Directory:      {stats.get('image_directory', 'N/A')}")
-        print(f"Diagrams Found:       {stats.get('total_diagrams', 0)}")
-        print(f"Successful Converts:  {stats.get('successful_conversions', 0)}")
-        print(f"Failed Converts:      {stats.get('failed_conversions', 0)}")
-        print(f"Rolled Back:          {'Yes' if rolled_back else 'No'}")
+        lines = [
+            "\n--- Conversion Summary ---",
+            f"Input File:           {stats.get('input_file_path', abs_input_file_path)}",
+            f"Converter Used:       {method_used}",
+        ]
+        if method_used == "kroki":
+            lines.append(f"Kroki URL:            {args.kroki_url}")
+        lines.append(f"Output File:          {output_display}")
+        lines.append(f"Image Directory:      {stats.get('image_directory', 'N/A')}")
+        lines.append(f"Diagrams Found:       {stats.get('total_diagrams', 0)}")
+        lines.append(f"Successful Converts:  {stats.get('successful_conversions', 0)}")
+        lines.append(f"Failed Converts:      {failed_conversions}")
+        lines.append(f"Rolled Back:          {'Yes' if rolled_back else 'No'}")
         # Show move/readme status only if attempted and not rolled back
         if args.move_original and not rolled_back and exit_code == 0:
             moved_status = "Yes" if original_moved else "No"
@@ -662,18 +762,20 @@ def main():
                 if original_moved
                 else "(Check logs for errors)"
             )
-            print(f"Original File Moved:  {moved_status} {dest_dir_display}")
+            lines.append(f"Original File Moved:  {moved_status} {dest_dir_display}")
             if original_moved and args.add_readme:
                 readme_status = "Yes" if readme_added else "No (Check logs for errors)"
-                print(f"Readme Added:         {readme_status}")
-
-        print(final_message)  # Print the final status message
+                lines.append(f"Readme Added:         {readme_status}")
+        lines.append(final_message)  # The final status message
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()  # Emit the whole summary before any later stderr output
         sys.exit(exit_code)  # Exit with appropriate code
 
     except Exception as proc_err:
         # Catch unexpected errors during the main processing call or post-processing
         logger.critical(
-            f"An unexpected error occurred during file processing: {proc_err}",
+            "An unexpected error occurred during file processing: %s",
+            proc_err,
             exc_info=True,
         )
         print(f"\nError: An unexpected problem occurred: {proc_err}", file=sys.stderr)
@@ -700,6 +802,7 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         # Handle Ctrl+C gracefully
         print("\nOperation cancelled by user (KeyboardInterrupt).", file=sys.stderr)
+        _close_file_log()  # Push queued/buffered records to the log file
         # Perform any necessary cleanup here if needed
         sys.exit(130)  # Standard exit code for Ctrl+C
     except Exception as top_level_err:
@@ -708,12 +811,11 @@ if __name__ == "__main__":
             f"\nFATAL ERROR: An unexpected error occurred: {top_level_err}",
             file=sys.stderr,
         )
-        traceback.print_exc()
-        # Attempt to log the fatal error if logger was set up
+        # Log the traceback exactly once; the configured handlers (or logging's
+        # last-resort stderr handler) print it, so no separate print_exc()
         try:
-            logging.getLogger(__name__).critical(
-                f"FATAL ERROR: {top_level_err}", exc_info=True
-            )
+            _LOG.critical("FATAL ERROR: %s", top_level_err, exc_info=True)
+            _close_file_log()
         except Exception:
             pass
         sys.exit(1)  # Critical error exit code
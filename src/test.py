@@ -1,3 +1,5 @@
+import os
+
 import mermaid as md
 from mermaid.graph import Graph
 
@@ -20,9 +22,11 @@ erDiagram
 # Create a Graph object with the syntax
 graph = Graph("erdiagram", mermaid_syntax)
 
-# Generate the SVG content directly from the Graph object
-md.Mermaid(graph).to_svg("./src/image/mermaid_diagram.svg")
-md.Mermaid(graph).to_png("./src/image/mermaid_diagram.png")
+# Render once and write both formats from the same renderer
+os.makedirs("./src/image", exist_ok=True)
+renderer = md.Mermaid(graph)
+renderer.to_svg("./src/image/mermaid_diagram.svg")
+renderer.to_png("./src/image/mermaid_diagram.png")
 
 
 print("Mermaid diagram saved as mermaid_diagram")
@@ -1,21 +1,75 @@
 import base64
-import io
+import concurrent.futures
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
 
-import matplotlib.pyplot as plt
 import requests
-from PIL import Image
+from requests.adapters import HTTPAdapter
+
+# Rendered PNGs from mermaid.ink, keyed by a hash of the encoded diagram
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "mermaid_ink")
+
+# One pooled session so repeated renders reuse the TLS connection to mermaid.ink
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
+# Upper bound on concurrent requests to mermaid.ink, across all batches
+MAX_CONCURRENT_RENDERS = 8
+_RENDER_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_RENDERS)
+
+
+def mermaid_to_images(jobs, dpi=1200):
+    """Renders (graph_definition, filename) pairs concurrently."""
+    jobs = list(jobs)
+    if len(jobs) <= 1:
+        for graph, filename in jobs:
+            _render_one(graph, filename, dpi)  # No pool for a single diagram
+        return
+    workers = min(MAX_CONCURRENT_RENDERS, len(jobs))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_render_one, graph, filename, dpi)
+            for graph, filename in jobs
+        ]
+        for future in futures:
+            future.result()  # Re-raise the first failure, in job order
 
 
 def mermaid_to_image(graph_definition, filename="diagram.png", dpi=1200):
+    """
+    Saves the mermaid.ink PNG for graph_definition to filename, unchanged.
+    dpi is kept for signature compatibility only; there is no re-encode step
+    for it to apply to.
+    """
+    mermaid_to_images([(graph_definition, filename)], dpi=dpi)
+
+
+def _render_one(graph_definition, filename, dpi):
     graph_bytes = graph_definition.encode("utf8")
     base64_bytes = base64.urlsafe_b64encode(graph_bytes)
     base64_string = base64_bytes.decode("ascii")
-    image_data = requests.get("https://mermaid.ink/img/" + base64_string).content
 
-    img = Image.open(io.BytesIO(image_data))
-    plt.imshow(img)
-    plt.axis("off")
-    plt.savefig(filename, dpi=dpi)
+    cache_key = hashlib.sha256(base64_bytes).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, cache_key + ".png")
+    if os.path.exists(cache_path):
+        shutil.copyfile(cache_path, filename)  # Same diagram: no network call
+        return
+
+    # mermaid.ink already returns a PNG; store its bytes as-is
+    with _RENDER_SLOTS:
+        response = _SESSION.get("https://mermaid.ink/img/" + base64_string, timeout=30)
+    response.raise_for_status()
+    image_data = response.content
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = cache_path + f".{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(image_data)
+    os.replace(tmp_path, cache_path)  # Readers never see a partial cache entry
+    shutil.copyfile(cache_path, filename)
 
 
 mermaid_code = """